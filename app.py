@@ -1,23 +1,29 @@
 from flask import (
     Flask, request, jsonify, render_template, redirect, url_for,
-    session, g
+    session, g, make_response, send_from_directory, abort
 )
 from flask_cors import CORS
-import joblib
-import re
-import sqlite3
+from werkzeug.utils import safe_join
+import json
+import mimetypes
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
-from datetime import datetime
+from datetime import date
 import os
 
+from scoring_daemon import load_model, predict_many
+from shadow import load_shadow_scorer
+from stats import ALL_DAYS, ALL_USERS
+from storage import get_storage, DuplicateUserError
+
 # -------------------------
 # Configuration
 # -------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "users.db")
-MODEL_PATH = os.path.join(BASE_DIR, "custom_model.pkl")
-VECT_PATH = os.path.join(BASE_DIR, "tfidf_vectorizer.pkl")
+DIST_DIR = os.path.join(BASE_DIR, "static", "dist")
+ASSET_MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+# Usernames allowed to read any user's /stats (comma-separated)
+STATS_ADMINS = {u.strip() for u in os.environ.get("STATS_ADMINS", "").split(",") if u.strip()}
 
 app = Flask(__name__, template_folder="templates", static_folder="static")
 app.secret_key = "replace_this_with_a_random_secret_in_production"
@@ -26,51 +32,92 @@ CORS(app)
 # -------------------------
 # Load ML model
 # -------------------------
+# Same preprocessing and scoring code as the local daemon and CLI (scoring_daemon.py)
 try:
-    model = joblib.load(MODEL_PATH)
-    vectorizer = joblib.load(VECT_PATH)
+    load_model()
 except Exception as e:
     raise RuntimeError(f"Could not load model/vectorizer: {e}")
 
 # -------------------------
-# Database helpers
+# Storage (SQLite by default, see storage.py)
+# -------------------------
+storage = get_storage()
+storage.init()
+
+# Optional challenger model scored in the background (see shadow.py)
+shadow_scorer = load_shadow_scorer(storage)
+
+# -------------------------
+# Fingerprinted static assets (built by build_assets.py)
+# -------------------------
+try:
+    with open(ASSET_MANIFEST_PATH) as f:
+        asset_manifest = json.load(f)
+except (OSError, ValueError):
+    asset_manifest = {}
+
+@app.url_defaults
+def hashed_static_url(endpoint, values):
+    # url_for('static', filename='style.css') -> /static/dist/style.<hash>.css
+    if endpoint == "static" and values.get("filename") in asset_manifest:
+        values["filename"] = asset_manifest[values["filename"]]
+
+def accepts_webp():
+    # Exact match only: "*/*" clients (curl, scripts) keep getting the PNG
+    return any(value == "image/webp" and quality > 0 for value, quality in request.accept_mimetypes)
+
+@app.route("/static/dist/<path:filename>")
+def static_dist(filename):
+    path = safe_join(DIST_DIR, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    # style.<hash>.css: the content hash doubles as a stable ETag, unlike
+    # Werkzeug's mtime/size one, which changes whenever the build is re-run
+    digest = os.path.basename(filename).split(".")[-2]
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    variant, encoding, vary = "identity", None, []
+
+    if os.path.isfile(path + ".webp"):
+        vary.append("Accept")
+        if accepts_webp():
+            variant, mimetype = "webp", "image/webp"
+            filename += ".webp"
+    elif os.path.isfile(path + ".gz"):
+        vary.append("Accept-Encoding")
+        for enc, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if request.accept_encodings[enc] > 0 and os.path.isfile(path + suffix):
+                variant = encoding = enc
+                filename += suffix
+                break
+
+    # Hashed names never change content, so they can be cached forever;
+    # send_from_directory still answers If-None-Match with a 304.
+    response = send_from_directory(DIST_DIR, filename, mimetype=mimetype,
+                                   max_age=31536000, etag=f"{digest}-{variant}")
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    for header in vary:
+        response.vary.add(header)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+# -------------------------
+# Cached rendering of static pages
 # -------------------------
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def init_db():
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            nickname TEXT,
-            phone TEXT,
-            email TEXT UNIQUE,
-            password TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS predictions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            review TEXT,
-            result TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(user_id) REFERENCES users(id)
-        )
-    """)
-
-    conn.commit()
-    conn.close()
-
-init_db()
+page_cache = {}
+
+def render_cached(template):
+    body = page_cache.get(template)
+    if body is None:
+        body = render_template(template)
+        if not app.debug:
+            page_cache[template] = body
+
+    response = make_response(body)
+    response.add_etag()
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
 
 # -------------------------
 # Helper: login required
@@ -83,30 +130,21 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# -------------------------
-# Clean text for ML
-# -------------------------
-def clean_text(text):
-    text = str(text or "")
-    text = text.lower()
-    text = re.sub(r'https?://\S+|www\.\S+', ' ', text)
-    text = re.sub(r'<.*?>', ' ', text)
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
 # -------------------------
 # Load logged-in user
 # -------------------------
+# Endpoints whose responses never depend on the session. Not touching the
+# session there keeps Flask from adding "Vary: Cookie", so shared caches and
+# CDNs can store them, and skips the user lookup on every asset request.
+SESSIONLESS_ENDPOINTS = {"static", "static_dist", "home_page", "about_page", "team_page", "contact_page"}
+
 @app.before_request
 def load_logged_in_user():
     g.user = None
+    if request.endpoint in SESSIONLESS_ENDPOINTS:
+        return
     if "user_id" in session:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT id, username, nickname FROM users WHERE id = ?", (session["user_id"],))
-        row = cur.fetchone()
-        conn.close()
+        row = storage.get_user(session["user_id"])
         if row:
             g.user = {
                 "id": row["id"],
@@ -120,19 +158,19 @@ def load_logged_in_user():
 
 @app.route("/")
 def home_page():
-    return render_template("index.html")
+    return render_cached("index.html")
 
 @app.route("/about")
 def about_page():
-    return render_template("about.html")
+    return render_cached("about.html")
 
 @app.route("/team")
 def team_page():
-    return render_template("team.html")
+    return render_cached("team.html")
 
 @app.route("/contact")
 def contact_page():
-    return render_template("contact.html")
+    return render_cached("contact.html")
 
 
 # -------------------------
@@ -160,17 +198,8 @@ def login_page():
     if not user_input or not password:
         return "<script>alert('Please provide username/email and password'); window.location='/login';</script>"
 
-    conn = get_db_connection()
-    cur = conn.cursor()
-
     # LOGIN USING USERNAME OR EMAIL
-    cur.execute("""
-        SELECT * FROM users 
-        WHERE username = ? OR email = ?
-    """, (user_input, user_input))
-
-    user = cur.fetchone()
-    conn.close()
+    user = storage.find_user(user_input)
 
     if user and check_password_hash(user["password"], password):
         session["user_id"] = user["id"]
@@ -205,16 +234,9 @@ def register_page():
     hashed = generate_password_hash(password)
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO users (username, nickname, phone, email, password) VALUES (?, ?, ?, ?, ?)",
-            (username, nickname, phone, email, hashed)
-        )
-        conn.commit()
-        conn.close()
+        storage.create_user(username, nickname, phone, email, hashed)
         return "<script>alert('Registration successful! Please login.'); window.location='/login';</script>"
-    except sqlite3.IntegrityError as e:
+    except DuplicateUserError as e:
         print("❌ DB Integrity Error:", e)
         return f"<script>alert('Error: {str(e)}'); window.location='/register';</script>"
     except Exception as e:
@@ -230,14 +252,7 @@ def logout():
 @login_required
 def history_page():
     uid = session.get("user_id")
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT review, result, created_at FROM predictions WHERE user_id = ? ORDER BY created_at DESC",
-        (uid,)
-    )
-    rows = cur.fetchall()
-    conn.close()
+    rows = storage.history(uid)
     return render_template("history.html", predictions=rows)
 
 # -------------------------
@@ -254,30 +269,57 @@ def predict():
     if not isinstance(review, str) or review.strip() == "":
         return jsonify({"error": "Empty review"}), 400
 
-    clean = clean_text(review)
-
     try:
-        X = vectorizer.transform([clean])
-        pred = model.predict(X)[0]
-        result = "REAL" if int(pred) == 0 else "FAKE"
+        result = predict_many([review])[0]
     except Exception as e:
         return jsonify({"error": f"Prediction failed: {e}"}), 500
 
+    if shadow_scorer is not None:
+        shadow_scorer.submit(review, result)
+
     userid = session.get("user_id")
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO predictions (user_id, review, result, created_at) VALUES (?, ?, ?, ?)",
-            (userid, review, result, datetime.utcnow().isoformat())
-        )
-        conn.commit()
-        conn.close()
+        # Queued; written in bulk by the storage backend's batch writer
+        storage.log_prediction(userid, review, result)
     except Exception:
         pass
 
     return jsonify({"prediction": result}), 200
 
+# -------------------------
+# API - Prediction statistics
+# -------------------------
+@app.route("/stats")
+@login_required
+def stats():
+    # ?day=YYYY-MM-DD and ?user_id=N narrow the counts; both default to all.
+    # Per-user counts are limited to your own id unless you're in STATS_ADMINS.
+    day = request.args.get("day", ALL_DAYS)
+    try:
+        user_id = int(request.args.get("user_id", ALL_USERS))
+    except ValueError:
+        return jsonify({"error": "Invalid user_id"}), 400
+
+    if day != ALL_DAYS:
+        try:
+            valid_day = date.fromisoformat(day).isoformat() == day
+        except ValueError:
+            valid_day = False
+        if not valid_day:
+            return jsonify({"error": "Invalid day, expected YYYY-MM-DD or 'all'"}), 400
+
+    if user_id not in (ALL_USERS, session["user_id"]) and session.get("username") not in STATS_ADMINS:
+        return jsonify({"error": "Forbidden"}), 403
+
+    counts = storage.stats(day, user_id)
+
+    return jsonify({
+        "day": day,
+        "user_id": None if user_id == ALL_USERS else user_id,
+        "counts": counts,
+        "total": sum(counts.values())
+    }), 200
+
 
 # -------------------------
 # Run server
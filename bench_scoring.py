@@ -0,0 +1,69 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from scoring_daemon import SOCKET_PATH, score_remote
+
+# Usage: python bench_scoring.py [http://127.0.0.1:5000/predict]
+# Start `python scoring_daemon.py serve` first for the warm numbers.
+HTTP_URL = sys.argv[1] if len(sys.argv) > 1 else None
+REVIEW = "Amazing product, five stars, buy it now!"
+RUNS = 10
+REQUESTS = 500
+BATCH = 10000
+
+
+def ms(values):
+    values = sorted(values)
+    return (f"p50={statistics.median(values) * 1000:8.2f} ms  "
+            f"p99={values[int(0.99 * (len(values) - 1))] * 1000:8.2f} ms")
+
+
+def timed_process(env):
+    cmd = [sys.executable, "scoring_daemon.py", "score", REVIEW]
+    start = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.perf_counter() - start
+
+
+def main():
+    # Cold start: a fresh process with no daemon loads the pickles itself
+    cold_env = dict(os.environ, SCORING_SOCKET="/nonexistent/scoring.sock")
+    print(f"{'cold start process':<28}{ms([timed_process(cold_env) for _ in range(RUNS)])}")
+
+    if not os.path.exists(SOCKET_PATH):
+        print(f"\nNo daemon at {SOCKET_PATH}; start `python scoring_daemon.py serve` for warm numbers.")
+        return
+
+    print(f"{'CLI process via daemon':<28}{ms([timed_process(os.environ) for _ in range(RUNS)])}")
+
+    times = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        score_remote([REVIEW])
+        times.append(time.perf_counter() - start)
+    print(f"{'warm daemon, 1 review':<28}{ms(times)}")
+
+    start = time.perf_counter()
+    score_remote([REVIEW] * BATCH)
+    elapsed = time.perf_counter() - start
+    print(f"{'warm daemon, pipelined':<28}{elapsed / BATCH * 1e6:8.1f} us/review ({BATCH} reviews)")
+
+    if HTTP_URL:
+        body = json.dumps({"review": REVIEW}).encode("utf-8")
+        times = []
+        for _ in range(REQUESTS):
+            req = urllib.request.Request(HTTP_URL, data=body, headers={"Content-Type": "application/json"})
+            start = time.perf_counter()
+            urllib.request.urlopen(req).read()
+            times.append(time.perf_counter() - start)
+        print(f"{'HTTP /predict':<28}{ms(times)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from stats import rebuild_stats, get_stats, ALL_DAYS, ALL_USERS
+
+# Usage: python bench_stats.py [rows]
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+USERS = 1000
+DAYS = 365
+REPEAT = 20
+
+
+def create_predictions(conn):
+    conn.execute("""
+        CREATE TABLE predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            review TEXT,
+            result TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def synthetic_rows(n):
+    start = datetime(2025, 1, 1)
+    rnd = random.Random(42)
+    for _ in range(n):
+        ts = start + timedelta(seconds=rnd.randrange(DAYS * 86400))
+        user = rnd.randrange(1, USERS + 1) if rnd.random() < 0.9 else None
+        yield (user, "synthetic review text", rnd.choice(("FAKE", "REAL")), ts.isoformat())
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0, result
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    conn = sqlite3.connect(path)
+    create_predictions(conn)
+
+    print(f"Inserting {ROWS} synthetic predictions...")
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO predictions (user_id, review, result, created_at) VALUES (?, ?, ?, ?)",
+        synthetic_rows(ROWS)
+    )
+    conn.commit()
+    plain_insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuild_stats(conn)
+    rebuild = time.perf_counter() - start
+
+    # Same rows again, now through the triggers, to price the write overhead
+    conn.execute("DELETE FROM predictions")
+    conn.execute("DELETE FROM prediction_stats")
+    conn.commit()
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO predictions (user_id, review, result, created_at) VALUES (?, ?, ?, ?)",
+        synthetic_rows(ROWS)
+    )
+    conn.commit()
+    trigger_insert = time.perf_counter() - start
+
+    day, user = "2025-06-01", 7
+    queries = [
+        ("overall",
+         lambda: conn.execute("SELECT result, COUNT(*) FROM predictions GROUP BY result").fetchall(),
+         lambda: get_stats(conn, ALL_DAYS, ALL_USERS)),
+        ("per day",
+         lambda: conn.execute(
+             "SELECT result, COUNT(*) FROM predictions WHERE substr(created_at, 1, 10) = ? GROUP BY result",
+             (day,)).fetchall(),
+         lambda: get_stats(conn, day, ALL_USERS)),
+        ("per user",
+         lambda: conn.execute(
+             "SELECT result, COUNT(*) FROM predictions WHERE user_id = ? GROUP BY result",
+             (user,)).fetchall(),
+         lambda: get_stats(conn, ALL_DAYS, user)),
+        ("per day + user",
+         lambda: conn.execute(
+             "SELECT result, COUNT(*) FROM predictions WHERE substr(created_at, 1, 10) = ? AND user_id = ? GROUP BY result",
+             (day, user)).fetchall(),
+         lambda: get_stats(conn, day, user)),
+    ]
+
+    print(f"\nBulk insert, no triggers:   {plain_insert:.2f} s")
+    print(f"Bulk insert, with triggers: {trigger_insert:.2f} s")
+    print(f"rebuild_stats():            {rebuild:.2f} s")
+    print(f"\n{'query':<16}{'GROUP BY ms':>14}{'summary ms':>14}{'speedup':>12}")
+    for name, naive, summary in queries:
+        naive_ms, naive_rows = timed(naive)
+        summary_ms, counts = timed(summary)
+        assert dict(naive_rows) == {k: v for k, v in counts.items() if v}, name
+        print(f"{name:<16}{naive_ms:>14.3f}{summary_ms:>14.4f}{naive_ms / summary_ms:>11.0f}x")
+
+    conn.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
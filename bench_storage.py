@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from storage import SQLiteStorage, MongoStorage, DuplicateUserError, MONGO_URI
+
+# Usage: python bench_storage.py [writers] [predictions_per_writer]
+# Set MONGO_URI to benchmark a real MongoDB; otherwise the Mongo backend
+# runs against mongomock, an in-process stand-in (pip install -r requirements-dev.txt).
+WRITERS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+PER_WRITER = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+
+def run_writers(log):
+    def writer(n):
+        for i in range(PER_WRITER):
+            log(n + 1, f"synthetic review {n}-{i}", "FAKE" if i % 3 else "REAL")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(WRITERS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return start
+
+
+def report(name, start, total):
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36}{total / elapsed:>12,.0f} writes/s  ({elapsed:.2f} s)")
+
+
+def check(storage):
+    """Round-trip the interface the app uses, on a freshly initialised store."""
+    storage.create_user("bench", "b", "", "bench@example.com", "hash")
+    try:
+        storage.create_user("bench", "b", "", "other@example.com", "hash")
+        raise AssertionError("duplicate username accepted")
+    except DuplicateUserError:
+        pass
+    user = storage.find_user("bench@example.com")
+    assert storage.get_user(user["id"])["username"] == "bench"
+
+
+def bench_sqlite_unbatched(path):
+    # What app.py did before: a connection and a commit per prediction
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE predictions (id INTEGER PRIMARY KEY, user_id INTEGER, review TEXT, result TEXT, created_at TIMESTAMP)")
+    conn.close()
+
+    def log(user_id, review, result):
+        for _ in range(100):
+            try:
+                conn = sqlite3.connect(path)
+                conn.execute(
+                    "INSERT INTO predictions (user_id, review, result, created_at) VALUES (?, ?, ?, ?)",
+                    (user_id, review, result, datetime.utcnow().isoformat())
+                )
+                conn.commit()
+                conn.close()
+                return
+            except sqlite3.OperationalError:
+                time.sleep(0.001)  # database is locked
+
+    report("sqlite, one commit per insert", run_writers(log), WRITERS * PER_WRITER)
+
+
+def bench_storage(name, storage):
+    storage.init()
+    check(storage)
+    start = run_writers(storage.log_prediction)
+    storage.flush()
+    report(name, start, WRITERS * PER_WRITER)
+
+    total = WRITERS * PER_WRITER
+    assert sum(storage.stats().values()) == total, storage.stats()
+    assert len(storage.history(1)) == PER_WRITER
+
+
+def main():
+    print(f"{WRITERS} concurrent writers x {PER_WRITER} predictions\n")
+    tmp = tempfile.mkdtemp()
+
+    bench_sqlite_unbatched(os.path.join(tmp, "unbatched.db"))
+    bench_storage("sqlite, batched executemany", SQLiteStorage(os.path.join(tmp, "batched.db")))
+
+    if "MONGO_URI" in os.environ:
+        storage = MongoStorage(MONGO_URI, f"bench_{int(time.time())}")
+        bench_storage("mongo, batched insert_many", storage)
+        storage.client.drop_database(storage.db.name)
+    else:
+        import mongomock
+        bench_storage("mongomock, batched insert_many", MongoStorage(client=mongomock.MongoClient()))
+
+
+if __name__ == "__main__":
+    main()
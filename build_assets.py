@@ -0,0 +1,113 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+
+from PIL import Image
+
+# Optional: .br copies are skipped if the brotli module is missing
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# Already-compressed formats gain nothing from gzip/brotli
+COMPRESSIBLE = {".css", ".js", ".svg", ".html", ".txt", ".json"}
+
+# Images are scaled down to 2x their largest displayed CSS width. The big
+# illustrations are shown at most 380px wide (about.css .about-robot);
+# login_robot_small.png is shown at 80-120px (predict.css, style.css).
+DEFAULT_IMAGE_WIDTH = 760
+IMAGE_WIDTHS = {
+    "login_robot_small.png": 240,
+}
+WEBP_QUALITY = 85
+
+
+def resized_png(src, name):
+    """Return (png_bytes, webp_bytes) for an image scaled to its max width."""
+    with Image.open(src) as img:
+        img.load()
+    max_width = IMAGE_WIDTHS.get(name, DEFAULT_IMAGE_WIDTH)
+    if img.width > max_width:
+        height = round(img.height * max_width / img.width)
+        img = img.resize((max_width, height), Image.LANCZOS)
+
+    png = io.BytesIO()
+    img.save(png, format="PNG", optimize=True)
+    webp = io.BytesIO()
+    img.save(webp, format="WEBP", quality=WEBP_QUALITY, method=6)
+    return png.getvalue(), webp.getvalue()
+
+
+def write_compressed(path, data):
+    with gzip.open(path + ".gz", "wb", compresslevel=9) as f:
+        f.write(data)
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+
+def build():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+    if brotli is None:
+        print("⚠️  brotli not installed, writing gzip copies only")
+
+    manifest = {}
+    total_before = total_after = total_plain = 0
+    for name in sorted(os.listdir(STATIC_DIR)):
+        src = os.path.join(STATIC_DIR, name)
+        if not os.path.isfile(src):
+            continue
+
+        stem, ext = os.path.splitext(name)
+        webp = None
+        if ext.lower() == ".png":
+            data, webp = resized_png(src, name)
+        else:
+            with open(src, "rb") as f:
+                data = f.read()
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = f"{stem}.{digest}{ext}"
+        out = os.path.join(DIST_DIR, hashed)
+        with open(out, "wb") as f:
+            f.write(data)
+
+        # Smallest variant a browser can be sent: .webp for images, .gz for text
+        smallest = len(data)
+        if webp is not None:
+            with open(out + ".webp", "wb") as f:
+                f.write(webp)
+            smallest = min(smallest, len(webp))
+        if ext.lower() in COMPRESSIBLE:
+            write_compressed(out, data)
+            smallest = min(smallest, os.path.getsize(out + ".gz"))
+
+        before = os.path.getsize(src)
+        total_before += before
+        total_after += smallest
+        total_plain += len(data)
+        manifest[name] = f"dist/{hashed}"
+        print(f"{name}: {before:,} B -> {hashed}: {len(data):,} B"
+              + (f", webp {len(webp):,} B" if webp is not None else ""))
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"\n✅ Wrote {len(manifest)} assets to {DIST_DIR}")
+    print(f"Total: {total_before:,} B -> {total_plain:,} B as PNG/uncompressed, "
+          f"{total_after:,} B with webp/gzip ({(1 - total_after / total_before) * 100:.1f}% saved)")
+
+
+if __name__ == "__main__":
+    build()
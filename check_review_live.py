@@ -1,17 +1,7 @@
-import re
-import joblib
+from scoring_daemon import score
 
-# Load saved model and vectorizer
-model = joblib.load("custom_model.pkl")
-vectorizer = joblib.load("tfidf_vectorizer.pkl")
-
-def clean_text(s):
-    s = s.lower()
-    s = re.sub(r'https?://\S+|www\.\S+', ' ', s)
-    s = re.sub(r'<.*?>', ' ', s)
-    s = re.sub(r'[^a-z0-9\s]', ' ', s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s
+# Uses the scoring daemon if it's running (python scoring_daemon.py serve),
+# otherwise loads the saved model and vectorizer in-process on first use
 
 print("\n🤖 FAKE REVIEW DETECTOR READY")
 print("----------------------------------")
@@ -23,11 +13,9 @@ while True:
         print("\n👋 Exiting Fake Review Detector...")
         break
 
-    clean = clean_text(text)
-    X = vectorizer.transform([clean])
-    prediction = model.predict(X)[0]
+    prediction = score([text])[0]
 
-    if prediction == 1:
+    if prediction == "FAKE":
         print("🚨 This review is likely *FAKE*! ")
     else:
         print("✅ This review seems *REAL*. ")
@@ -0,0 +1,206 @@
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+
+# -------------------------
+# Local scoring daemon over a Unix domain socket
+# -------------------------
+# Loading the pickles (and importing sklearn) costs far more than scoring
+# a review, so `python scoring_daemon.py serve` does it once and keeps it.
+#
+# Protocol: newline-delimited, one request per line, one JSON reply per
+# line, in order. Clients may pipeline many lines without waiting; every
+# complete line that has arrived is vectorized and scored as one batch.
+#   {"review": "..."}        -> {"prediction": "FAKE"}
+#   {"reviews": ["...", ..]} -> {"predictions": ["FAKE", "REAL", ..]}
+#   any other line           -> scored as raw review text
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "custom_model.pkl")
+VECT_PATH = os.path.join(BASE_DIR, "tfidf_vectorizer.pkl")
+# The socket lives in a directory only this user can enter: $XDG_RUNTIME_DIR
+# when there is one, otherwise a per-user 0700 directory in the temp dir.
+# Otherwise another local user could bind the path first and answer with
+# fake verdicts.
+SOCKET_DIR = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+    tempfile.gettempdir(), f"fake-review-detector-{os.getuid()}"
+)
+SOCKET_PATH = os.environ.get("SCORING_SOCKET", os.path.join(SOCKET_DIR, "fake-review-detector.sock"))
+
+# Reviews per pipelined round trip in the client
+CLIENT_BATCH = 256
+
+_model = None
+_vectorizer = None
+
+
+def clean_text(text):
+    text = str(text or "")
+    text = text.lower()
+    text = re.sub(r'https?://\S+|www\.\S+', ' ', text)
+    text = re.sub(r'<.*?>', ' ', text)
+    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def load_model():
+    global _model, _vectorizer
+    if _model is None:
+        import joblib  # deferred: clients talking to the daemon never pay for it
+        _model = joblib.load(MODEL_PATH)
+        _vectorizer = joblib.load(VECT_PATH)
+    return _model, _vectorizer
+
+
+def predict_many(reviews):
+    if not reviews:
+        return []
+    model, vectorizer = load_model()
+    X = vectorizer.transform([clean_text(r) for r in reviews])
+    return ["REAL" if int(p) == 0 else "FAKE" for p in model.predict(X)]
+
+
+def socket_dir_is_private(socket_path):
+    """True if the socket's directory is ours and closed to other users."""
+    try:
+        st = os.stat(os.path.dirname(socket_path) or ".")
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+# -------------------------
+# Server
+# -------------------------
+def parse_line(line):
+    """Return (reviews, is_batch) for one request line."""
+    text = line.decode("utf-8", errors="replace")
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return [text], False
+    if isinstance(data, dict):
+        if isinstance(data.get("reviews"), list):
+            return [str(r) for r in data["reviews"]], True
+        if "review" in data:
+            return [str(data["review"])], False
+    return [text], False
+
+
+class ScoringHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        buf = b""
+        while True:
+            chunk = self.request.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            lines = [l for l in lines if l.strip()]
+            if lines:
+                self.request.sendall(self.respond(lines))
+
+    def respond(self, lines):
+        requests = [parse_line(l) for l in lines]
+        flat = [r for reviews, _ in requests for r in reviews]
+        try:
+            verdicts = predict_many(flat)
+        except Exception as e:
+            reply = json.dumps({"error": f"Prediction failed: {e}"}) + "\n"
+            return (reply * len(requests)).encode("utf-8")
+
+        out = []
+        pos = 0
+        for reviews, is_batch in requests:
+            chunk = verdicts[pos:pos + len(reviews)]
+            pos += len(reviews)
+            out.append({"predictions": chunk} if is_batch else {"prediction": chunk[0]})
+        return "".join(json.dumps(o) + "\n" for o in out).encode("utf-8")
+
+
+class ScoringServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path=SOCKET_PATH):
+    socket_dir = os.path.dirname(socket_path) or "."
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    if not socket_dir_is_private(socket_path):
+        sys.exit(f"❌ {socket_dir} must be owned by you and not accessible to others (chmod 700)")
+
+    # Only clear the path if nothing is listening on it any more
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except FileNotFoundError:
+            pass
+        except ConnectionRefusedError:
+            os.remove(socket_path)  # stale socket from a previous run
+        else:
+            sys.exit(f"❌ A scoring daemon is already listening on {socket_path}")
+
+    load_model()
+
+    # Turn SIGTERM into a normal exit so the socket file gets removed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    with ScoringServer(socket_path, ScoringHandler) as server:
+        print(f"🤖 Scoring daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
+# -------------------------
+# Client
+# -------------------------
+def score_remote(reviews, socket_path=SOCKET_PATH):
+    if not socket_dir_is_private(socket_path):
+        raise ConnectionRefusedError(f"Not using {socket_path}: its directory is not private")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        rfile = sock.makefile("rb")
+        verdicts = []
+        for i in range(0, len(reviews), CLIENT_BATCH):
+            batch = reviews[i:i + CLIENT_BATCH]
+            sock.sendall("".join(json.dumps({"review": r}) + "\n" for r in batch).encode("utf-8"))
+            for _ in batch:
+                line = rfile.readline()
+                if not line:
+                    raise ConnectionError("Scoring daemon closed the connection")
+                reply = json.loads(line)
+                if "error" in reply:
+                    raise RuntimeError(reply["error"])
+                verdicts.append(reply["prediction"])
+        return verdicts
+
+
+def score(reviews, socket_path=SOCKET_PATH):
+    """Score reviews via the daemon, or in-process if it isn't running."""
+    try:
+        return score_remote(reviews, socket_path)
+    except OSError:
+        return predict_many(reviews)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("serve", "score"):
+        print("Usage: python scoring_daemon.py serve")
+        print("       python scoring_daemon.py score [review ...]   (reads stdin lines if no reviews given)")
+        sys.exit(2)
+
+    if sys.argv[1] == "serve":
+        serve()
+    else:
+        reviews = sys.argv[2:] or [l.rstrip("\n") for l in sys.stdin if l.strip()]
+        for verdict in score(reviews):
+            print(verdict)
@@ -0,0 +1,110 @@
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+
+import joblib
+
+from scoring_daemon import clean_text
+
+# -------------------------
+# Shadow scoring of a challenger model
+# -------------------------
+# A sampled share of live /predict traffic is re-scored by a challenger
+# vectorizer + model on background worker threads. The request thread only
+# does a non-blocking put on a bounded queue; when the queue is full the
+# sample is dropped so the primary response never waits on the shadow.
+# Samples and drop counts are stored through the app's Storage backend.
+
+CHALLENGER_MODEL_PATH = os.environ.get("CHALLENGER_MODEL_PATH", "")
+CHALLENGER_VECT_PATH = os.environ.get("CHALLENGER_VECT_PATH", "")
+SHADOW_SAMPLE_RATE = float(os.environ.get("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_WORKERS = int(os.environ.get("SHADOW_WORKERS", "2"))
+SHADOW_QUEUE_SIZE = int(os.environ.get("SHADOW_QUEUE_SIZE", "256"))
+
+
+class ShadowScorer:
+    def __init__(self, storage, model, vectorizer,
+                 sample_rate=SHADOW_SAMPLE_RATE, workers=SHADOW_WORKERS,
+                 queue_size=SHADOW_QUEUE_SIZE):
+        self.storage = storage
+        self.model = model
+        self.vectorizer = vectorizer
+        self.sample_rate = sample_rate
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0           # since start, for this process
+        self.pending_drops = 0     # not yet written to shadow_drops
+        self.drop_lock = threading.Lock()
+
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, name=f"shadow-{i}", daemon=True)
+            t.start()
+        atexit.register(self.flush_drops)
+
+    def submit(self, review, primary_result):
+        """Queue a review for shadow scoring. Never blocks the caller."""
+        if random.random() >= self.sample_rate:
+            return False
+        try:
+            self.queue.put_nowait((review, primary_result))
+            return True
+        except queue.Full:
+            with self.drop_lock:
+                self.dropped += 1
+                self.pending_drops += 1
+            return False
+
+    def flush_drops(self):
+        """Write pending drop counts; they are kept for a retry if that fails."""
+        with self.drop_lock:
+            dropped, self.pending_drops = self.pending_drops, 0
+        if not dropped:
+            return
+        try:
+            self.storage.record_shadow_drops(datetime.utcnow().strftime("%Y-%m-%dT%H:%M"), dropped)
+        except Exception:
+            with self.drop_lock:
+                self.pending_drops += dropped
+            raise
+
+    def _score(self, clean):
+        start = time.perf_counter()
+        X = self.vectorizer.transform([clean])
+        pred = self.model.predict(X)[0]
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        return ("REAL" if int(pred) == 0 else "FAKE"), latency_ms
+
+    def _worker(self):
+        while True:
+            review, primary_result = self.queue.get()
+            try:
+                shadow_result, latency_ms = self._score(clean_text(review))
+                # Only disagreements keep the review text, as samples to inspect
+                self.storage.log_shadow(
+                    primary_result, shadow_result, latency_ms,
+                    None if shadow_result == primary_result else review, datetime.utcnow()
+                )
+                # Drops only happen while the queue is full, so workers are busy
+                # and will pick these up on their next sample
+                self.flush_drops()
+            except Exception as e:
+                print("❌ Shadow scoring failed:", e)
+            finally:
+                self.queue.task_done()
+
+
+def load_shadow_scorer(storage):
+    """Build a ShadowScorer from the environment, or None if not configured."""
+    if not CHALLENGER_MODEL_PATH or not CHALLENGER_VECT_PATH or SHADOW_SAMPLE_RATE <= 0:
+        return None
+    try:
+        model = joblib.load(CHALLENGER_MODEL_PATH)
+        vectorizer = joblib.load(CHALLENGER_VECT_PATH)
+        return ShadowScorer(storage, model, vectorizer)
+    except Exception as e:
+        print("❌ Could not load challenger model/vectorizer, shadow mode disabled:", e)
+        return None
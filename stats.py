@@ -0,0 +1,111 @@
+# -------------------------
+# Incrementally maintained prediction statistics
+# -------------------------
+# prediction_stats holds one counter per (day, user_id, result), kept in
+# step with the predictions table by triggers, so every lookup is a single
+# primary-key read instead of a GROUP BY over all predictions.
+#
+# Rollup rows use sentinels:
+#   day = 'all'    -> all days
+#   user_id = -1   -> all users
+#   user_id = 0    -> anonymous predictions (user_id IS NULL)
+
+ALL_DAYS = "all"
+ALL_USERS = -1
+ANONYMOUS = 0
+RESULTS = ("FAKE", "REAL")
+
+
+def _rollup_values(row):
+    day = f"substr({row}.created_at, 1, 10)"
+    user = f"COALESCE({row}.user_id, {ANONYMOUS})"
+    return [
+        (day, user),
+        (day, str(ALL_USERS)),
+        (f"'{ALL_DAYS}'", user),
+        (f"'{ALL_DAYS}'", str(ALL_USERS)),
+    ]
+
+
+def _backfill(conn):
+    conn.execute("DELETE FROM prediction_stats")
+    for day, user in _rollup_values("p"):
+        conn.execute(f"""
+            INSERT INTO prediction_stats (day, user_id, result, count)
+            SELECT {day}, {user}, p.result, COUNT(*)
+            FROM predictions AS p
+            GROUP BY 1, 2, 3
+        """)
+
+
+def init_stats(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prediction_stats'"
+    ).fetchone()
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS prediction_stats (
+            day TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            result TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, user_id, result)
+        ) WITHOUT ROWID
+    """)
+
+    inserts = ",\n".join(
+        f"({day}, {user}, NEW.result, 1)" for day, user in _rollup_values("NEW")
+    )
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS predictions_stats_insert
+        AFTER INSERT ON predictions
+        BEGIN
+            INSERT INTO prediction_stats (day, user_id, result, count)
+            VALUES {inserts}
+            ON CONFLICT (day, user_id, result) DO UPDATE SET count = count + 1;
+        END
+    """)
+
+    keys = " OR ".join(
+        f"(day = {day} AND user_id = {user})" for day, user in _rollup_values("OLD")
+    )
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS predictions_stats_delete
+        AFTER DELETE ON predictions
+        BEGIN
+            UPDATE prediction_stats SET count = count - 1
+            WHERE result = OLD.result AND ({keys});
+        END
+    """)
+
+    # Databases that already hold predictions start from a full count
+    if not exists:
+        _backfill(conn)
+
+
+def rebuild_stats(conn):
+    """Recompute prediction_stats from scratch with one pass per rollup."""
+    init_stats(conn)
+    _backfill(conn)
+    conn.commit()
+
+
+def get_stats(conn, day=ALL_DAYS, user_id=ALL_USERS):
+    cur = conn.execute(
+        "SELECT result, count FROM prediction_stats WHERE day = ? AND user_id = ? AND result IN (?, ?)",
+        (day, user_id) + RESULTS
+    )
+    counts = {r: 0 for r in RESULTS}
+    for result, count in cur.fetchall():
+        counts[result] = count
+    return counts
+
+
+if __name__ == "__main__":
+    # Rebuild whichever backend STORAGE_BACKEND selects (see storage.py)
+    from storage import get_storage
+
+    storage = get_storage()
+    storage.init()
+    storage.rebuild_stats()
+    print(f"✅ prediction_stats rebuilt: {storage.stats()}")
@@ -0,0 +1,483 @@
+import atexit
+from abc import ABC, abstractmethod
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from stats import init_stats, get_stats, rebuild_stats, ALL_DAYS, ALL_USERS, ANONYMOUS, RESULTS
+
+# -------------------------
+# Pluggable storage backends
+# -------------------------
+# app.py talks to users, prediction logging and history through a Storage
+# object. STORAGE_BACKEND picks the implementation:
+#   sqlite (default) -> SQLITE_PATH, users.db next to the app by default
+#   mongo            -> MONGO_URI / MONGO_DB
+#
+# Prediction logging is asynchronous: log_prediction() queues the row and a
+# background thread writes queued rows in bulk (executemany / insert_many),
+# so request threads no longer contend for SQLite's single write lock.
+# Shadow scoring results (see shadow.py) are stored by the same backend.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("SQLITE_PATH", os.path.join(BASE_DIR, "users.db"))
+
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "sqlite")
+MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
+MONGO_DB = os.environ.get("MONGO_DB", "fake_review_detector")
+MONGO_POOL_SIZE = int(os.environ.get("MONGO_POOL_SIZE", "50"))
+
+WRITE_BATCH_SIZE = int(os.environ.get("WRITE_BATCH_SIZE", "500"))
+WRITE_FLUSH_INTERVAL = float(os.environ.get("WRITE_FLUSH_INTERVAL", "0.05"))
+WRITE_QUEUE_SIZE = 10000
+STATS_WRITE_RETRIES = 3
+
+
+def _rollup_keys(user_id, result, created_at):
+    """prediction_stats keys one prediction counts towards (see stats.py)."""
+    day = created_at.date().isoformat()
+    user = ANONYMOUS if user_id is None else user_id
+    return [(d, u, result) for d, u in ((day, user), (day, ALL_USERS), (ALL_DAYS, user), (ALL_DAYS, ALL_USERS))]
+
+
+class DuplicateUserError(Exception):
+    """Username or email is already registered."""
+
+
+class BatchWriter:
+    """Collects rows on a queue and hands them to `write` in batches.
+
+    A batch is written once it reaches `batch_size` rows or `flush_interval`
+    seconds after its first row arrived, whichever comes first. `put` only
+    blocks when the queue is full, which pushes back on writers that
+    outrun the database.
+    """
+
+    def __init__(self, write, batch_size=WRITE_BATCH_SIZE,
+                 flush_interval=WRITE_FLUSH_INTERVAL, queue_size=WRITE_QUEUE_SIZE):
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+
+        threading.Thread(target=self._run, name="batch-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def put(self, row):
+        self.queue.put(row)
+
+    def flush(self):
+        """Block until every queued row has been written."""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self.write(batch)
+            except Exception as e:
+                print(f"❌ Failed to write {len(batch)} predictions:", e)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+class Storage(ABC):
+    """Interface shared by the storage backends."""
+
+    @abstractmethod
+    def init(self):
+        """Create tables/collections and indexes if missing."""
+
+    @abstractmethod
+    def create_user(self, username, nickname, phone, email, password_hash):
+        """Insert a user; raises DuplicateUserError on a taken username/email."""
+
+    @abstractmethod
+    def get_user(self, user_id):
+        pass
+
+    @abstractmethod
+    def find_user(self, login):
+        """Look a user up by username or email."""
+
+    def log_prediction(self, user_id, review, result, created_at=None):
+        """Queue one prediction for the next bulk write."""
+        self.writer.put((user_id, review, result, created_at or datetime.utcnow()))
+
+    @abstractmethod
+    def log_predictions(self, rows):
+        """Write (user_id, review, result, created_at) rows in one bulk call."""
+
+    @abstractmethod
+    def history(self, user_id):
+        """A user's predictions, newest first."""
+
+    @abstractmethod
+    def stats(self, day=ALL_DAYS, user_id=ALL_USERS):
+        """FAKE/REAL counts for a day and/or user, from the summary table."""
+
+    @abstractmethod
+    def rebuild_stats(self):
+        """Recompute the summary table from the stored predictions."""
+
+    @abstractmethod
+    def log_shadow(self, primary_result, shadow_result, latency_ms, review, created_at):
+        """Record one shadow-scored sample; `review` is None when they agree."""
+
+    @abstractmethod
+    def record_shadow_drops(self, minute, dropped):
+        """Add `dropped` to the shadow queue-full counter for `minute`."""
+
+    @abstractmethod
+    def shadow_report(self, limit=20):
+        """Shadow totals, sorted latencies and the latest disagreements/drops."""
+
+    def flush(self):
+        self.writer.flush()
+
+
+# -------------------------
+# SQLite
+# -------------------------
+class SQLiteStorage(Storage):
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.writer = BatchWriter(self.log_predictions)
+
+    def connection(self):
+        # One connection per thread, reused across requests
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self.local.conn = conn
+        return conn
+
+    def init(self):
+        conn = self.connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                nickname TEXT,
+                phone TEXT,
+                email TEXT UNIQUE,
+                password TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                review TEXT,
+                result TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id)
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_predictions_user_created ON predictions (user_id, created_at)"
+        )
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS shadow_predictions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                primary_result TEXT,
+                shadow_result TEXT,
+                agree INTEGER,
+                latency_ms REAL,
+                review TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Shadow samples dropped because the queue was full, per minute
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS shadow_drops (
+                minute TEXT PRIMARY KEY,
+                dropped INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        init_stats(conn)
+        conn.commit()
+
+    def create_user(self, username, nickname, phone, email, password_hash):
+        conn = self.connection()
+        try:
+            conn.execute(
+                "INSERT INTO users (username, nickname, phone, email, password) VALUES (?, ?, ?, ?, ?)",
+                (username, nickname, phone, email, password_hash)
+            )
+            conn.commit()
+        except sqlite3.IntegrityError as e:
+            conn.rollback()
+            raise DuplicateUserError(str(e))
+
+    def get_user(self, user_id):
+        row = self.connection().execute(
+            "SELECT id, username, nickname FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def find_user(self, login):
+        row = self.connection().execute(
+            "SELECT * FROM users WHERE username = ? OR email = ?", (login, login)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def log_predictions(self, rows):
+        conn = self.connection()
+        conn.executemany(
+            "INSERT INTO predictions (user_id, review, result, created_at) VALUES (?, ?, ?, ?)",
+            [(u, rev, res, ts.isoformat()) for u, rev, res, ts in rows]
+        )
+        conn.commit()
+
+    def history(self, user_id):
+        rows = self.connection().execute(
+            "SELECT review, result, created_at FROM predictions WHERE user_id = ? ORDER BY created_at DESC",
+            (user_id,)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def stats(self, day=ALL_DAYS, user_id=ALL_USERS):
+        return get_stats(self.connection(), day, user_id)
+
+    def rebuild_stats(self):
+        rebuild_stats(self.connection())
+
+    def log_shadow(self, primary_result, shadow_result, latency_ms, review, created_at):
+        conn = self.connection()
+        conn.execute(
+            "INSERT INTO shadow_predictions (primary_result, shadow_result, agree, latency_ms, review, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (primary_result, shadow_result, int(primary_result == shadow_result),
+             latency_ms, review, created_at.isoformat())
+        )
+        conn.commit()
+
+    def record_shadow_drops(self, minute, dropped):
+        conn = self.connection()
+        conn.execute(
+            "INSERT INTO shadow_drops (minute, dropped) VALUES (?, ?) "
+            "ON CONFLICT (minute) DO UPDATE SET dropped = dropped + excluded.dropped",
+            (minute, dropped)
+        )
+        conn.commit()
+
+    def shadow_report(self, limit=20):
+        conn = self.connection()
+        total, agreed = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(agree), 0) FROM shadow_predictions"
+        ).fetchone()
+        return {
+            "total": total,
+            "agreed": agreed,
+            "dropped": conn.execute("SELECT COALESCE(SUM(dropped), 0) FROM shadow_drops").fetchone()[0],
+            "latencies": [r[0] for r in conn.execute(
+                "SELECT latency_ms FROM shadow_predictions ORDER BY latency_ms")],
+            "disagreements": [dict(r) for r in conn.execute(
+                "SELECT primary_result, shadow_result, review, created_at FROM shadow_predictions "
+                "WHERE agree = 0 ORDER BY created_at DESC LIMIT ?", (limit,))],
+            "drop_minutes": [dict(r) for r in conn.execute(
+                "SELECT minute, dropped FROM shadow_drops ORDER BY minute DESC LIMIT ?", (limit,))],
+        }
+
+
+# -------------------------
+# MongoDB
+# -------------------------
+class MongoStorage(Storage):
+    """MongoDB backend.
+
+    User ids are integers from a counters collection, so sessions and
+    /stats see the same ids as with SQLite. prediction_stats is updated with
+    $inc upserts right after each bulk insert, counting only the rows that
+    were actually inserted and retrying upserts that lose a race on the
+    unique key. Without a replica set the two writes are still not one
+    transaction; `python stats.py` rebuilds the counters if they drift.
+    """
+
+    def __init__(self, uri=MONGO_URI, db_name=MONGO_DB, client=None):
+        if client is None:
+            from pymongo import MongoClient
+            client = MongoClient(uri, maxPoolSize=MONGO_POOL_SIZE)
+        self.client = client
+        self.db = client[db_name]
+        self.writer = BatchWriter(self.log_predictions)
+
+    def init(self):
+        from pymongo import ASCENDING, DESCENDING
+        self.db.users.create_index([("username", ASCENDING)], unique=True)
+        self.db.users.create_index([("email", ASCENDING)], unique=True)
+        self.db.predictions.create_index([("user_id", ASCENDING), ("created_at", DESCENDING)])
+        self.db.prediction_stats.create_index(
+            [("day", ASCENDING), ("user_id", ASCENDING), ("result", ASCENDING)], unique=True
+        )
+        self.db.shadow_predictions.create_index([("agree", ASCENDING), ("created_at", DESCENDING)])
+
+    def create_user(self, username, nickname, phone, email, password_hash):
+        from pymongo import ReturnDocument
+        from pymongo.errors import DuplicateKeyError
+        counter = self.db.counters.find_one_and_update(
+            {"_id": "users"}, {"$inc": {"seq": 1}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        try:
+            self.db.users.insert_one({
+                "_id": counter["seq"],
+                "username": username,
+                "nickname": nickname,
+                "phone": phone,
+                "email": email,
+                "password": password_hash,
+                "created_at": datetime.utcnow()
+            })
+        except DuplicateKeyError as e:
+            raise DuplicateUserError(str(e))
+
+    def _user(self, doc):
+        if doc is None:
+            return None
+        doc["id"] = doc.pop("_id")
+        return doc
+
+    def get_user(self, user_id):
+        return self._user(self.db.users.find_one(
+            {"_id": user_id}, {"username": 1, "nickname": 1}
+        ))
+
+    def find_user(self, login):
+        return self._user(self.db.users.find_one(
+            {"$or": [{"username": login}, {"email": login}]}
+        ))
+
+    def log_predictions(self, rows):
+        from pymongo.errors import BulkWriteError
+        if not rows:
+            return
+        error = None
+        try:
+            self.db.predictions.insert_many(
+                [{"user_id": u, "review": rev, "result": res, "created_at": ts} for u, rev, res, ts in rows],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Unordered: everything except the reported rows was inserted
+            failed = {err["index"] for err in e.details.get("writeErrors", [])}
+            rows = [row for i, row in enumerate(rows) if i not in failed]
+            error = e
+
+        self._inc_stats(rows)
+        if error is not None:
+            raise error
+
+    def _inc_stats(self, rows):
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+        # Same rollups as the SQLite triggers, pre-summed per batch
+        counts = Counter(k for u, _, res, ts in rows for k in _rollup_keys(u, res, ts))
+        ops = [
+            UpdateOne({"day": d, "user_id": u, "result": r}, {"$inc": {"count": n}}, upsert=True)
+            for (d, u, r), n in counts.items()
+        ]
+        for attempt in range(STATS_WRITE_RETRIES):
+            if not ops:
+                return
+            try:
+                self.db.prediction_stats.bulk_write(ops, ordered=False)
+                return
+            except BulkWriteError as e:
+                # Concurrent upserts of a new key can fail with a duplicate key
+                # error; the failed $inc was not applied, so it is safe to resend
+                failed = {err["index"] for err in e.details.get("writeErrors", [])}
+                ops = [op for i, op in enumerate(ops) if i in failed]
+                if attempt == STATS_WRITE_RETRIES - 1:
+                    raise
+
+    def history(self, user_id):
+        cursor = self.db.predictions.find(
+            {"user_id": user_id}, {"_id": 0, "review": 1, "result": 1, "created_at": 1}
+        ).sort("created_at", -1)
+        return [dict(d, created_at=d["created_at"].isoformat()) for d in cursor]
+
+    def stats(self, day=ALL_DAYS, user_id=ALL_USERS):
+        counts = {r: 0 for r in RESULTS}
+        for doc in self.db.prediction_stats.find({"day": day, "user_id": user_id}):
+            if doc["result"] in counts:
+                counts[doc["result"]] = doc["count"]
+        return counts
+
+    def rebuild_stats(self):
+        # Run while no predictions are being logged; rows written between the
+        # scan and the insert would be counted twice or not at all
+        self.db.prediction_stats.delete_many({})
+        counts = Counter(
+            k for d in self.db.predictions.find({}, {"user_id": 1, "result": 1, "created_at": 1})
+            for k in _rollup_keys(d["user_id"], d["result"], d["created_at"])
+        )
+        if counts:
+            self.db.prediction_stats.insert_many([
+                {"day": d, "user_id": u, "result": r, "count": n} for (d, u, r), n in counts.items()
+            ], ordered=False)
+
+
+    def log_shadow(self, primary_result, shadow_result, latency_ms, review, created_at):
+        self.db.shadow_predictions.insert_one({
+            "primary_result": primary_result,
+            "shadow_result": shadow_result,
+            "agree": primary_result == shadow_result,
+            "latency_ms": latency_ms,
+            "review": review,
+            "created_at": created_at
+        })
+
+    def record_shadow_drops(self, minute, dropped):
+        self.db.shadow_drops.update_one({"_id": minute}, {"$inc": {"dropped": dropped}}, upsert=True)
+
+    def shadow_report(self, limit=20):
+        shadow = self.db.shadow_predictions
+        return {
+            "total": shadow.count_documents({}),
+            "agreed": shadow.count_documents({"agree": True}),
+            "dropped": sum(d["dropped"] for d in self.db.shadow_drops.find()),
+            "latencies": sorted(d["latency_ms"] for d in shadow.find({}, {"latency_ms": 1})),
+            "disagreements": [
+                dict(d, created_at=d["created_at"].isoformat())
+                for d in shadow.find(
+                    {"agree": False},
+                    {"_id": 0, "primary_result": 1, "shadow_result": 1, "review": 1, "created_at": 1}
+                ).sort("created_at", -1).limit(limit)
+            ],
+            "drop_minutes": [
+                {"minute": d["_id"], "dropped": d["dropped"]}
+                for d in self.db.shadow_drops.find().sort("_id", -1).limit(limit)
+            ],
+        }
+
+
+def get_storage():
+    if STORAGE_BACKEND == "mongo":
+        return MongoStorage()
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteStorage()
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
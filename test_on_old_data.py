@@ -1,7 +1,8 @@
 import pandas as pd
-import re
 import joblib
 
+from scoring_daemon import clean_text
+
 # Load model and vectorizer
 model = joblib.load("custom_model.pkl")
 vectorizer = joblib.load("tfidf_vectorizer.pkl")
@@ -9,15 +10,7 @@ vectorizer = joblib.load("tfidf_vectorizer.pkl")
 # Load OLD Yelp dataset chunk
 df = pd.read_csv("DataBase/reviews_part0.csv")   # your old data
 
-# STEP 1: Text Cleaning
-def clean_text(s):
-    s = str(s).lower()
-    s = re.sub(r'https?://\S+|www\.\S+', ' ', s)
-    s = re.sub(r'<.*?>', ' ', s)
-    s = re.sub(r'[^a-z0-9\s]', ' ', s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s
-
+# STEP 1: Text Cleaning (clean_text from scoring_daemon.py)
 df["clean_text"] = df["text"].apply(clean_text)
 
 # STEP 2: TF-IDF on old data
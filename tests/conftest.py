@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# app.py builds its storage at import time; keep tests off the real users.db
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "users.db")
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["STATS_ADMINS"] = "boss"
+os.environ.pop("CHALLENGER_MODEL_PATH", None)
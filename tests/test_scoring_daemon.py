@@ -0,0 +1,44 @@
+import os
+import socket
+
+import pytest
+
+import scoring_daemon
+
+
+@pytest.fixture
+def private_dir(tmp_path):
+    d = tmp_path / "run"
+    d.mkdir(mode=0o700)
+    return d
+
+
+def test_clean_text():
+    assert scoring_daemon.clean_text("Great <b>product</b>!! See https://x.io NOW") == "great product see now"
+    assert scoring_daemon.clean_text(None) == ""
+
+
+def test_serve_leaves_a_running_daemons_socket_alone(private_dir):
+    path = str(private_dir / "scoring.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+        live.bind(path)
+        live.listen()
+        with pytest.raises(SystemExit, match="already listening"):
+            scoring_daemon.serve(path)
+        assert os.path.exists(path)
+
+
+def test_serve_refuses_a_shared_directory(private_dir):
+    private_dir.chmod(0o777)
+    with pytest.raises(SystemExit, match="not accessible to others"):
+        scoring_daemon.serve(str(private_dir / "scoring.sock"))
+
+
+def test_client_ignores_sockets_in_shared_directories(private_dir):
+    path = str(private_dir / "scoring.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as fake:
+        fake.bind(path)
+        fake.listen()
+        private_dir.chmod(0o777)
+        with pytest.raises(ConnectionRefusedError):
+            scoring_daemon.score_remote(["a review"], path)
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from shadow import ShadowScorer
+from storage import SQLiteStorage
+
+
+class StubVectorizer:
+    def transform(self, texts):
+        return texts
+
+
+class SlowModel:
+    """Always says FAKE (1), slowly enough to keep a tiny queue full."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def predict(self, X):
+        time.sleep(self.delay)
+        return [1] * len(X)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    s = SQLiteStorage(str(tmp_path / "test.db"))
+    s.init()
+    return s
+
+
+def test_submit_never_blocks_and_counts_drops(storage):
+    scorer = ShadowScorer(storage, SlowModel(0.2), StubVectorizer(),
+                          sample_rate=1.0, workers=1, queue_size=1)
+
+    submitted = []
+    start = time.perf_counter()
+    for i in range(10):
+        primary = "FAKE" if i % 2 else "REAL"
+        review = f"Review #{i}!"
+        submitted.append((review, primary, scorer.submit(review, primary)))
+    # Ten submits against a 200 ms model must not wait on it
+    assert time.perf_counter() - start < 0.1
+
+    accepted = [(r, p) for r, p, ok in submitted if ok]
+    dropped = sum(1 for _, _, ok in submitted if not ok)
+    assert dropped >= 8
+    assert scorer.dropped == dropped
+
+    scorer.queue.join()
+    scorer.flush_drops()
+
+    report = storage.shadow_report()
+    assert report["total"] == len(accepted)
+    assert report["dropped"] == dropped
+    assert report["agreed"] == sum(1 for _, p in accepted if p == "FAKE")
+    assert all(ms >= 200 for ms in report["latencies"])
+    # Disagreements keep the review as submitted, not the cleaned text
+    assert sorted(d["review"] for d in report["disagreements"]) == \
+        sorted(r for r, p in accepted if p == "REAL")
+
+
+def test_sample_rate_zero_skips_everything(storage):
+    scorer = ShadowScorer(storage, SlowModel(0), StubVectorizer(), sample_rate=0.0, workers=1)
+    assert not scorer.submit("anything", "FAKE")
+    assert scorer.dropped == 0
+    assert storage.shadow_report()["total"] == 0
+
+
+def test_failed_drop_write_is_kept_for_retry(storage, monkeypatch):
+    scorer = ShadowScorer(storage, SlowModel(0), StubVectorizer(), sample_rate=1.0, workers=0)
+    scorer.pending_drops = 5
+
+    def fail(minute, dropped):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(storage, "record_shadow_drops", fail)
+    with pytest.raises(RuntimeError):
+        scorer.flush_drops()
+    assert scorer.pending_drops == 5
+
+    monkeypatch.undo()
+    scorer.flush_drops()
+    assert scorer.pending_drops == 0
+    assert storage.shadow_report()["dropped"] == 5
@@ -0,0 +1,61 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def app_module():
+    # conftest.py points SQLITE_PATH at a temp DB and sets STATS_ADMINS
+    import app
+
+    client = app.app.test_client()
+    for name in ("alice", "bob", "boss"):
+        client.post("/register", data={
+            "username": name, "email": f"{name}@example.com",
+            "password": "pw", "confirm_password": "pw"
+        })
+    return app
+
+
+def login(app_module, username):
+    client = app_module.app.test_client()
+    client.post("/login", data={"username": username, "password": "pw"})
+    return client
+
+
+def user_id(app_module, username):
+    return app_module.storage.find_user(username)["id"]
+
+
+def test_anonymous_is_redirected_to_login(app_module):
+    response = app_module.app.test_client().get("/stats")
+    assert response.status_code == 302
+    assert "/login" in response.headers["Location"]
+
+
+def test_own_user_id_is_allowed(app_module):
+    client = login(app_module, "alice")
+    response = client.get(f"/stats?user_id={user_id(app_module, 'alice')}")
+    assert response.status_code == 200
+    assert response.get_json()["counts"] == {"FAKE": 0, "REAL": 0}
+
+
+def test_overall_and_per_day_are_allowed(app_module):
+    client = login(app_module, "alice")
+    assert client.get("/stats").status_code == 200
+    assert client.get("/stats?day=2025-06-01").status_code == 200
+
+
+def test_other_user_id_is_forbidden(app_module):
+    client = login(app_module, "alice")
+    assert client.get(f"/stats?user_id={user_id(app_module, 'bob')}").status_code == 403
+    assert client.get("/stats?user_id=0").status_code == 403
+
+
+def test_stats_admin_can_read_any_user(app_module):
+    client = login(app_module, "boss")
+    assert client.get(f"/stats?user_id={user_id(app_module, 'alice')}").status_code == 200
+
+
+@pytest.mark.parametrize("query", ["user_id=abc", "user_id=1.5", "day=garbage", "day=2025-6-1", "day=20250601"])
+def test_invalid_parameters_are_rejected(app_module, query):
+    client = login(app_module, "alice")
+    assert client.get(f"/stats?{query}").status_code == 400
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import mongomock
+import pytest
+from pymongo.errors import BulkWriteError
+
+from stats import ALL_DAYS, ALL_USERS, ANONYMOUS
+from storage import SQLiteStorage, MongoStorage, DuplicateUserError
+
+DAY1 = datetime(2025, 6, 1, 9, 0)
+DAY2 = datetime(2025, 6, 2, 9, 0)
+
+
+@pytest.fixture(params=["sqlite", "mongo"])
+def storage(request, tmp_path):
+    if request.param == "sqlite":
+        s = SQLiteStorage(str(tmp_path / "test.db"))
+    else:
+        s = MongoStorage(client=mongomock.MongoClient())
+    s.init()
+    return s
+
+
+def register(storage, username, email):
+    storage.create_user(username, "nick", "", email, "hash")
+    return storage.find_user(username)["id"]
+
+
+def test_duplicate_username_raises(storage):
+    register(storage, "alice", "alice@example.com")
+    with pytest.raises(DuplicateUserError):
+        storage.create_user("alice", "", "", "other@example.com", "hash")
+
+
+def test_duplicate_email_raises(storage):
+    register(storage, "alice", "alice@example.com")
+    with pytest.raises(DuplicateUserError):
+        storage.create_user("bob", "", "", "alice@example.com", "hash")
+
+
+def test_find_user_by_email(storage):
+    uid = register(storage, "alice", "alice@example.com")
+    user = storage.find_user("alice@example.com")
+    assert user["id"] == uid
+    assert user["username"] == "alice"
+    assert user["password"] == "hash"
+    assert storage.get_user(uid)["username"] == "alice"
+    assert storage.find_user("nobody@example.com") is None
+
+
+def test_history_is_newest_first(storage):
+    uid = register(storage, "alice", "alice@example.com")
+    other = register(storage, "bob", "bob@example.com")
+    storage.log_prediction(uid, "first", "REAL", DAY1)
+    storage.log_prediction(other, "not mine", "FAKE", DAY1)
+    storage.log_prediction(uid, "second", "FAKE", DAY2)
+    storage.flush()
+
+    rows = storage.history(uid)
+    assert [r["review"] for r in rows] == ["second", "first"]
+    assert [r["result"] for r in rows] == ["FAKE", "REAL"]
+
+
+def test_stats_rollups(storage):
+    uid = register(storage, "alice", "alice@example.com")
+    storage.log_prediction(uid, "a", "FAKE", DAY1)
+    storage.log_prediction(uid, "b", "REAL", DAY2)
+    storage.log_prediction(None, "c", "FAKE", DAY1)
+    storage.log_prediction(None, "d", "FAKE", DAY2)
+    storage.flush()
+
+    assert storage.stats() == {"FAKE": 3, "REAL": 1}
+    assert storage.stats("2025-06-01", ALL_USERS) == {"FAKE": 2, "REAL": 0}
+    assert storage.stats(ALL_DAYS, uid) == {"FAKE": 1, "REAL": 1}
+    assert storage.stats(ALL_DAYS, ANONYMOUS) == {"FAKE": 2, "REAL": 0}
+    assert storage.stats("2025-06-02", ANONYMOUS) == {"FAKE": 1, "REAL": 0}
+    assert storage.stats("2025-06-03", ALL_USERS) == {"FAKE": 0, "REAL": 0}
+
+
+def test_rebuild_stats_matches_incremental(storage):
+    uid = register(storage, "alice", "alice@example.com")
+    for i in range(5):
+        storage.log_prediction(uid if i % 2 else None, f"r{i}", "FAKE" if i % 3 else "REAL", DAY1)
+    storage.flush()
+
+    before = [storage.stats(d, u) for d in (ALL_DAYS, "2025-06-01") for u in (ALL_USERS, uid, ANONYMOUS)]
+    storage.rebuild_stats()
+    after = [storage.stats(d, u) for d in (ALL_DAYS, "2025-06-01") for u in (ALL_USERS, uid, ANONYMOUS)]
+    assert before == after
+
+
+def test_mongo_partial_insert_counts_only_inserted_rows():
+    storage = MongoStorage(client=mongomock.MongoClient())
+    storage.init()
+    # Force one row of the batch to be rejected
+    storage.db.predictions.create_index("review", unique=True)
+    storage.log_predictions([(1, "dup", "FAKE", DAY1)])
+
+    with pytest.raises(BulkWriteError):
+        storage.log_predictions([(1, "dup", "FAKE", DAY1), (2, "new", "REAL", DAY1)])
+
+    assert storage.db.predictions.count_documents({}) == 2
+    assert storage.stats() == {"FAKE": 1, "REAL": 1}
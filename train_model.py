@@ -1,23 +1,16 @@
 import pandas as pd
-import re
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 import joblib
 
+from scoring_daemon import clean_text
+
 # STEP 1: Load custom dataset
 df = pd.read_csv("DataBase/custom_reviews_200.csv")   # <-- FIXED PATH
 
-# STEP 2: Clean text
-def clean_text(s):
-    s = s.lower()
-    s = re.sub(r'https?://\S+|www\.\S+', ' ', s)
-    s = re.sub(r'<.*?>', ' ', s)
-    s = re.sub(r'[^a-z0-9\s]', ' ', s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s
-
+# STEP 2: Clean text (clean_text from scoring_daemon.py)
 df["clean_text"] = df["text"].apply(clean_text)
 
 # STEP 3: Split data
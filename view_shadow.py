@@ -0,0 +1,40 @@
+from storage import get_storage
+
+# Reads from whichever backend STORAGE_BACKEND selects (see storage.py)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+    return values[k]
+
+
+storage = get_storage()
+storage.init()
+report = storage.shadow_report()
+total, agreed, dropped = report["total"], report["agreed"], report["dropped"]
+
+print("\nShadow scoring summary:\n")
+if dropped:
+    print(f"Dropped (queue full): {dropped} of {total + dropped} sampled "
+          f"({dropped / (total + dropped) * 100:.2f}%)")
+if total == 0:
+    print("No shadow predictions recorded yet.")
+else:
+    print(f"Samples:   {total}")
+    print(f"Agreement: {agreed / total * 100:.2f}%")
+
+    latencies = report["latencies"]
+    print(f"Challenger latency ms: p50={percentile(latencies, 50):.2f} "
+          f"p95={percentile(latencies, 95):.2f} p99={percentile(latencies, 99):.2f} "
+          f"max={latencies[-1]:.2f}")
+
+    if dropped:
+        print("\nRecent minutes with drops:\n")
+        for row in report["drop_minutes"]:
+            print((row["minute"], row["dropped"]))
+
+    print("\nRecent disagreements:\n")
+    for row in report["disagreements"]:
+        print((row["primary_result"], row["shadow_result"], row["review"], row["created_at"]))